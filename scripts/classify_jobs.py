@@ -14,23 +14,34 @@ Every job gets the full Condé Nast editorial treatment.
 import os
 import json
 import asyncio
+import hashlib
+import importlib.util
+import random
 import httpx
-from datetime import datetime
-from typing import Optional
-
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from itertools import islice
+from typing import Iterator, Optional
+
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
 # ZEP sync configuration
 ZEP_SYNC_ENABLED = os.environ.get('ZEP_SYNC_ENABLED', 'true').lower() == 'true'
 API_BASE_URL = os.environ.get('API_BASE_URL', 'https://parttime.quest')
 REVALIDATE_SECRET = os.environ.get('REVALIDATE_SECRET', '')
+ZEP_SYNC_MAX_ATTEMPTS = int(os.environ.get('ZEP_SYNC_MAX_ATTEMPTS', '5'))
 
-# Load environment variables
-from dotenv import load_dotenv
-load_dotenv()
+# LLM response cache configuration (see create-llm-cache-table.sql)
+LLM_CACHE_ENABLED = os.environ.get('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+LLM_CACHE_TTL_DAYS = int(os.environ.get('LLM_CACHE_TTL_DAYS', '30'))
 
 
 class StructuredJob(BaseModel):
@@ -151,12 +162,9 @@ class StructuredJob(BaseModel):
     """)
 
 
-# Create the Pydantic AI agent using Google Gemini
-# Set GEMINI_API_KEY or GOOGLE_API_KEY in environment
-agent = Agent(
-    'google-gla:gemini-2.0-flash',
-    output_type=StructuredJob,
-    system_prompt="""You are the senior content editor for Parttime.Quest, the UK's premier platform for part-time executive opportunities.
+CLASSIFIER_MODEL = 'google-gla:gemini-2.0-flash'
+
+SYSTEM_PROMPT = """You are the senior content editor for Parttime.Quest, the UK's premier platform for part-time executive opportunities.
 
 Your role is to transform raw job postings into beautifully crafted, editorially polished listings that attract top-tier part-time talent.
 
@@ -232,23 +240,52 @@ CRITICAL RULES:
 
 Remember: You're not just extracting data - you're crafting content that represents our brand.
 """
+
+# Create the Pydantic AI agent using Google Gemini
+# Set GEMINI_API_KEY or GOOGLE_API_KEY in environment
+agent = Agent(
+    CLASSIFIER_MODEL,
+    output_type=StructuredJob,
+    system_prompt=SYSTEM_PROMPT
 )
 
+# Cache keys change whenever the model, system prompt or output schema changes
+CACHE_NAMESPACE = hashlib.sha256(
+    f"{CLASSIFIER_MODEL}|{SYSTEM_PROMPT}|{json.dumps(StructuredJob.model_json_schema(), sort_keys=True)}".encode()
+).hexdigest()
 
-def get_db_connection():
-    """Get database connection"""
+
+def get_database_url() -> str:
+    """Get DATABASE_URL as a libpq connection string"""
     database_url = os.environ.get('DATABASE_URL')
     if not database_url:
         raise ValueError("DATABASE_URL environment variable not set")
-    return psycopg2.connect(database_url)
-
-
-def fetch_pending_raw_jobs(conn, limit: int = 10, source: str = None) -> list[dict]:
-    """Fetch raw jobs pending classification"""
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+    # Accept SQLAlchemy-style URLs, e.g. postgresql+psycopg2://...
+    scheme, sep, rest = database_url.partition('://')
+    if sep and '+' in scheme:
+        database_url = f"{scheme.split('+', 1)[0]}://{rest}"
+    return database_url
+
+
+def get_db_pool(max_size: int = 10) -> ConnectionPool:
+    """Get a database connection pool"""
+    # Repeated UPDATEs are server-side prepared after 3 executions
+    return ConnectionPool(
+        get_database_url(),
+        min_size=min(2, max_size),
+        max_size=max_size,
+        kwargs={'prepare_threshold': 3},
+        open=True,
+    )
+
+
+def fetch_pending_raw_jobs(pool: ConnectionPool, limit: int = 10, source: str = None, itersize: int = 500) -> Iterator[dict]:
+    """Stream raw jobs pending classification via a server-side cursor"""
+    with pool.connection() as conn, conn.cursor(name='pending_raw_jobs', row_factory=dict_row) as cur:
+        cur.itersize = itersize
         if source:
             cur.execute("""
-                SELECT r.id as raw_id, r.source, r.source_id, r.raw_data, r.job_id,
+                SELECT r.id::text as raw_id, r.source, r.source_id, r.raw_data, r.job_id::text as job_id,
                        j.title, j.company_name, j.location, j.full_description,
                        j.employment_type, j.seniority_level, j.compensation
                 FROM raw_jobs r
@@ -260,7 +297,7 @@ def fetch_pending_raw_jobs(conn, limit: int = 10, source: str = None) -> list[di
             """, (source, limit))
         else:
             cur.execute("""
-                SELECT r.id as raw_id, r.source, r.source_id, r.raw_data, r.job_id,
+                SELECT r.id::text as raw_id, r.source, r.source_id, r.raw_data, r.job_id::text as job_id,
                        j.title, j.company_name, j.location, j.full_description,
                        j.employment_type, j.seniority_level, j.compensation
                 FROM raw_jobs r
@@ -269,31 +306,113 @@ def fetch_pending_raw_jobs(conn, limit: int = 10, source: str = None) -> list[di
                 ORDER BY r.received_at DESC
                 LIMIT %s
             """, (limit,))
-        return [dict(row) for row in cur.fetchall()]
+        yield from cur
+
+
+def next_batch(rows: Iterator[dict], size: int) -> list[dict]:
+    """Pull the next `size` rows off a streaming cursor"""
+    return list(islice(rows, size))
+
+
+def report_cache_error(action: str, error: Exception):
+    """Log a cache failure - the cache is best-effort and never fails a job"""
+    global LLM_CACHE_ENABLED
+    if isinstance(error, psycopg.errors.UndefinedTable):
+        # Migration not applied yet: stop hitting the DB for the rest of the run
+        if LLM_CACHE_ENABLED:
+            print("    ⚠ LLM cache table missing (run create-llm-cache-table.sql) - cache disabled")
+        LLM_CACHE_ENABLED = False
+    else:
+        print(f"    ⚠ LLM cache {action} failed: {str(error)[:50]}")
+
+
+def get_cached_classification(pool: ConnectionPool, key: str) -> Optional[StructuredJob]:
+    """Look up a previous LLM classification for an identical job"""
+    try:
+        with pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT output::text FROM llm_classification_cache
+                WHERE key = %s
+                AND created_at > NOW() - make_interval(days => %s)
+            """, (key, LLM_CACHE_TTL_DAYS))
+            row = cur.fetchone()
+    except psycopg.Error as e:
+        report_cache_error('lookup', e)
+        return None
+    if not row:
+        return None
+    try:
+        # Parse and validate in one pass instead of json.loads + model_validate
+        return StructuredJob.model_validate_json(row[0])
+    except ValueError:
+        return None
+
+
+def expire_cached_classifications(pool: ConnectionPool):
+    """Delete cache entries older than LLM_CACHE_TTL_DAYS"""
+    try:
+        with pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                DELETE FROM llm_classification_cache
+                WHERE created_at < NOW() - make_interval(days => %s)
+            """, (LLM_CACHE_TTL_DAYS,))
+            if cur.rowcount:
+                print(f"Expired {cur.rowcount} LLM cache entries")
+    except psycopg.Error as e:
+        report_cache_error('expiry', e)
 
 
-async def classify_job(raw_job: dict) -> StructuredJob:
-    """Classify a single job using Pydantic AI"""
+def save_cached_classifications(pool: ConnectionPool, rows: list[tuple[str, StructuredJob]]):
+    """Store saved LLM classifications for reuse by identical jobs - rows are (key, structured)"""
+    try:
+        with pool.connection() as conn, conn.cursor() as cur:
+            cur.executemany("""
+                INSERT INTO llm_classification_cache (key, output, created_at)
+                VALUES (%s, %s::jsonb, NOW())
+                ON CONFLICT (key) DO UPDATE SET
+                    output = EXCLUDED.output,
+                    created_at = EXCLUDED.created_at
+            """, [(key, structured.model_dump_json()) for key, structured in rows])
+    except psycopg.Error as e:
+        # The jobs are already saved - caching is only an optimisation
+        report_cache_error('save', e)
+
+
+async def classify_job(raw_job: dict, pool: ConnectionPool = None) -> tuple[StructuredJob, Optional[str]]:
+    """Classify a single job using Pydantic AI, reusing cached output when a pool is given
+
+    Returns (structured, cache_key). cache_key is set for fresh LLM output and
+    should only be written to the cache once the job has been saved, so output
+    the database rejects is never replayed.
+    """
 
     raw_data = raw_job.get('raw_data', {})
     if isinstance(raw_data, str):
         raw_data = json.loads(raw_data)
 
+    title = raw_job.get('title') or raw_data.get('job_title', 'Unknown')
+    company = raw_job.get('company_name') or raw_data.get('company_name', 'Unknown')
+    location = raw_job.get('location') or raw_data.get('location', 'Unknown')
+    employment_type = raw_job.get('employment_type') or raw_data.get('employment_type', 'Unknown')
+    seniority = raw_job.get('seniority_level') or raw_data.get('seniority_level', 'Unknown')
+    compensation = raw_job.get('compensation') or raw_data.get('salary_range', 'Not specified')
+    description = raw_job.get('full_description') or raw_data.get('job_description', 'No description available')
+
     # Build comprehensive context
     context = f"""
 ## Job Details
 
-**Title:** {raw_job.get('title') or raw_data.get('job_title', 'Unknown')}
-**Company:** {raw_job.get('company_name') or raw_data.get('company_name', 'Unknown')}
-**Location:** {raw_job.get('location') or raw_data.get('location', 'Unknown')}
-**Employment Type:** {raw_job.get('employment_type') or raw_data.get('employment_type', 'Unknown')}
-**Seniority:** {raw_job.get('seniority_level') or raw_data.get('seniority_level', 'Unknown')}
-**Compensation:** {raw_job.get('compensation') or raw_data.get('salary_range', 'Not specified')}
+**Title:** {title}
+**Company:** {company}
+**Location:** {location}
+**Employment Type:** {employment_type}
+**Seniority:** {seniority}
+**Compensation:** {compensation}
 **Industry/Function:** {raw_data.get('job_function', 'Unknown')} / {raw_data.get('industries', 'Unknown')}
 
 ## Full Job Description
 
-{raw_job.get('full_description') or raw_data.get('job_description', 'No description available')}
+{description}
 
 ## Additional Context
 
@@ -303,14 +422,52 @@ async def classify_job(raw_job: dict) -> StructuredJob:
 - Source: {raw_job.get('source', 'Unknown')}
 """
 
-    result = await agent.run(f"Please analyze and structure this job posting into our editorial format:\n\n{context}")
-    return result.output
+    prompt = f"Please analyze and structure this job posting into our editorial format:\n\n{context}"
+
+    use_cache = LLM_CACHE_ENABLED and pool is not None
+    if use_cache:
+        # Key on the stable job fields only - posting age and applicant counts
+        # differ between reposts of the same job
+        stable_fields = [title, company, location, employment_type, seniority, compensation, description]
+        cache_key = hashlib.sha256(
+            json.dumps([CACHE_NAMESPACE, *stable_fields], default=str).encode()
+        ).hexdigest()
+        cached = await asyncio.to_thread(get_cached_classification, pool, cache_key)
+        if cached:
+            return cached, None
+
+    result = await agent.run(prompt)
+    return result.output, (cache_key if use_cache else None)
 
 
-def update_structured_job(conn, job_id: str, structured: StructuredJob):
-    """Update the jobs table with AI-structured data"""
+def update_structured_jobs(conn, rows: list[tuple[str, StructuredJob]]):
+    """Bulk update the jobs table with AI-structured data"""
+    params = [
+        (
+            structured.employment_type,
+            structured.is_fractional,
+            structured.days_per_week,
+            structured.is_remote,
+            structured.seniority_level,
+            structured.role_category,
+            structured.salary_min,
+            structured.salary_max,
+            structured.salary_currency,
+            structured.summary,
+            structured.opportunity_description,
+            structured.responsibilities,
+            structured.requirements,
+            structured.benefits,
+            structured.skills_required,
+            structured.about_company,
+            structured.company_domain,
+            f"Pydantic AI - Vertical: {structured.vertical}, City: {structured.city}, Country: {structured.country}",
+            job_id
+        )
+        for job_id, structured in rows
+    ]
     with conn.cursor() as cur:
-        cur.execute("""
+        cur.executemany("""
             UPDATE jobs SET
                 employment_type = %s,
                 is_fractional = %s,
@@ -333,139 +490,325 @@ def update_structured_job(conn, job_id: str, structured: StructuredJob):
                 classification_reasoning = %s,
                 updated_date = NOW()
             WHERE id = %s
-        """, (
-            structured.employment_type,
-            structured.is_fractional,
-            structured.days_per_week,
-            structured.is_remote,
-            structured.seniority_level,
-            structured.role_category,
-            structured.salary_min,
-            structured.salary_max,
-            structured.salary_currency,
-            structured.summary,
-            structured.opportunity_description,
-            structured.responsibilities,
-            structured.requirements,
-            structured.benefits,
-            structured.skills_required,
-            structured.about_company,
-            structured.company_domain,
-            f"Pydantic AI - Vertical: {structured.vertical}, City: {structured.city}, Country: {structured.country}",
-            job_id
-        ))
+        """, params)
 
 
-def mark_raw_job_processed(conn, raw_id: str, status: str = 'processed', error: str = None):
-    """Update raw_jobs status after processing"""
+def mark_raw_jobs_processed(conn, rows: list[tuple[str, str, Optional[str]]]):
+    """Bulk update raw_jobs status after processing - rows are (raw_id, status, error)"""
     with conn.cursor() as cur:
-        cur.execute("""
+        cur.executemany("""
             UPDATE raw_jobs SET
                 processing_status = %s,
                 processed_at = NOW(),
                 processing_error = %s
             WHERE id = %s
-        """, (status, error, raw_id))
+        """, [(status, error, raw_id) for raw_id, status, error in rows])
+
+
+def flush_job_updates(pool: ConnectionPool, updates: list[tuple[str, str, StructuredJob]], marks: list[tuple[str, str, Optional[str]]]) -> dict[str, str]:
+    """Write buffered job updates and raw_jobs statuses in one pipelined transaction
+
+    updates are (raw_id, job_id, structured). Returns {raw_id: error} for any
+    jobs that could not be saved and were marked as errors instead.
+    """
+    try:
+        # pool.connection() commits on successful exit
+        with pool.connection() as conn, conn.pipeline():
+            if updates:
+                update_structured_jobs(conn, [(job_id, structured) for _, job_id, structured in updates])
+            if marks:
+                mark_raw_jobs_processed(conn, marks)
+        return {}
+    except psycopg.Error as e:
+        # One bad row rolls back the whole batch - redo it row by row
+        print(f"\n    ⚠ Batch save failed, retrying row by row: {str(e)[:100]}")
+        return flush_job_updates_row_by_row(pool, updates, marks)
+
+
+def flush_job_updates_row_by_row(pool: ConnectionPool, updates: list[tuple[str, str, StructuredJob]], marks: list[tuple[str, str, Optional[str]]]) -> dict[str, str]:
+    """Save each job under its own savepoint so only offending rows are marked as errors"""
+    updates_by_raw_id = {raw_id: (job_id, structured) for raw_id, job_id, structured in updates}
+    failed = {}
+    with pool.connection() as conn, conn.transaction():
+        for raw_id, status, error in marks:
+            if raw_id in updates_by_raw_id:
+                try:
+                    with conn.transaction():
+                        update_structured_jobs(conn, [updates_by_raw_id[raw_id]])
+                except psycopg.Error as e:
+                    status, error = 'error', str(e)
+                    failed[raw_id] = error
+            mark_raw_jobs_processed(conn, [(raw_id, status, error)])
+    return failed
+
+
+def get_zep_client(max_connections: int = 10) -> httpx.AsyncClient:
+    """Get a pooled HTTP client for the ZEP sync API, reused across jobs"""
+    return httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        headers={
+            "Authorization": f"Bearer {REVALIDATE_SECRET}",
+            "Content-Type": "application/json",
+        },
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        # Multiplex concurrent syncs over one connection when h2 is installed (httpx[http2])
+        http2=importlib.util.find_spec('h2') is not None,
+    )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
 
 
-async def sync_job_to_zep(job_id: str, structured: StructuredJob, title: str, company: str, location: str) -> bool:
+async def sync_job_to_zep(client: httpx.AsyncClient, job_id: str, structured: StructuredJob, title: str, company: str, location: str) -> bool:
     """Sync a processed job to ZEP knowledge graph via API"""
     if not ZEP_SYNC_ENABLED:
         return True  # Skip but don't fail
 
-    try:
-        async with httpx.AsyncClient() as client:
+    for attempt in range(ZEP_SYNC_MAX_ATTEMPTS):
+        last_attempt = attempt == ZEP_SYNC_MAX_ATTEMPTS - 1
+        try:
             response = await client.post(
-                f"{API_BASE_URL}/api/graph/jobs",
+                "/api/graph/jobs",
                 json={
                     "action": "sync-one",
                     "jobId": job_id,
                 },
-                headers={
-                    "Authorization": f"Bearer {REVALIDATE_SECRET}",
-                    "Content-Type": "application/json",
-                },
-                timeout=30.0,
             )
-
+        except httpx.TransportError as e:
+            # Connection resets, timeouts etc. are worth retrying
+            if last_attempt:
+                print(f"    ⚠ ZEP sync error: {str(e)[:50]}")
+                return False
+        except Exception as e:
+            print(f"    ⚠ ZEP sync error: {str(e)[:50]}")
+            return False
+        else:
             if response.status_code == 200:
                 return True
-            else:
+            retryable = response.status_code == 429 or response.status_code >= 500
+            if not retryable or last_attempt:
                 print(f"    ⚠ ZEP sync failed: {response.status_code}")
                 return False
-    except Exception as e:
-        print(f"    ⚠ ZEP sync error: {str(e)[:50]}")
-        return False
+            # Honour the server's pacing when it tells us how long to back off
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                await asyncio.sleep(min(30.0, retry_after) + random.random() * 0.25)
+                continue
+
+        # Exponential backoff with jitter: ~0.5s, 1s, 2s, 4s
+        await asyncio.sleep(min(30.0, 0.5 * 2 ** attempt) + random.random() * 0.25)
 
+    return False
 
-async def process_jobs(limit: int = 10, source: str = None):
+
+async def process_jobs(limit: int = 10, source: str = None, concurrency: int = 10, batch_size: int = 500):
     """Main processing function"""
-    conn = get_db_connection()
+    # One extra connection is held by the streaming read cursor
+    pool = get_db_pool(max_size=concurrency + 1)
+    rows = fetch_pending_raw_jobs(pool, limit, source, itersize=batch_size)
+    zep_client = get_zep_client(max_connections=concurrency)
+    classifier = None
+    pending_fetch = None  # Read from `rows` currently running in a worker thread
 
     try:
-        jobs = fetch_pending_raw_jobs(conn, limit, source)
         print(f"\n{'='*60}")
         print(f"PYDANTIC AI JOB CLASSIFICATION")
         print(f"{'='*60}")
-        print(f"Found {len(jobs)} pending jobs to classify")
+        print(f"Streaming up to {limit} pending jobs to classify")
+        print(f"Concurrency: {concurrency}, Batch size: {batch_size}")
         print(f"{'='*60}\n")
 
+        if LLM_CACHE_ENABLED:
+            await asyncio.to_thread(expire_cached_classifications, pool)
+
+        # Sliding window: `concurrency` workers each keep one LLM call in flight,
+        # bounded queues keep memory at O(concurrency) regardless of --limit
+        job_queue = asyncio.Queue(maxsize=concurrency * 2)
+        result_queue = asyncio.Queue(maxsize=concurrency * 2)
+
+        async def produce():
+            nonlocal pending_fetch
+            cancelled = False
+            try:
+                while True:
+                    # Cancelling us can't stop the thread, so track it for teardown
+                    pending_fetch = asyncio.ensure_future(asyncio.to_thread(next_batch, rows, concurrency))
+                    if not (jobs := await asyncio.shield(pending_fetch)):
+                        break
+                    for job in jobs:
+                        await job_queue.put(job)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # Release every worker even if reading the stream failed, so their
+                # in-flight classifications still reach the consumer. On cancel the
+                # workers are cancelled too, and a blocking put could never return.
+                if not cancelled:
+                    for _ in range(concurrency):
+                        await job_queue.put(None)
+
+        async def classify_worker():
+            while (job := await job_queue.get()) is not None:
+                try:
+                    result = await classify_job(job, pool)
+                except Exception as e:
+                    result = e
+                await result_queue.put((job, result))
+
+        async def classify_all():
+            workers = [asyncio.create_task(classify_worker()) for _ in range(concurrency)]
+            try:
+                await produce()
+                await asyncio.gather(*workers)
+            except asyncio.CancelledError:
+                # The consumer has gone away - stop the workers rather than orphan them
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                raise
+            except Exception:
+                # produce() has released the workers; let them finish before waking the consumer
+                await asyncio.gather(*workers, return_exceptions=True)
+                await result_queue.put(None)
+                raise
+            await result_queue.put(None)
+
+        sync_semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded_sync(job: dict, structured: StructuredJob, title: str, company: str) -> bool:
+            async with sync_semaphore:
+                return await sync_job_to_zep(
+                    zep_client, job['job_id'], structured, title, company,
+                    structured.city or job.get('location', 'UK')
+                )
+
+        job_count = 0
         success_count = 0
         error_count = 0
 
-        for i, job in enumerate(jobs):
+        # Buffered writes, flushed every `batch_size` jobs
+        pending_updates = []  # (raw_id, job_id, structured)
+        pending_marks = []    # (raw_id, status, error)
+        pending_syncs = []    # (job, structured, title, company)
+        pending_cache = []    # (raw_id, cache_key, structured)
+
+        async def flush():
+            nonlocal success_count, error_count
+            failed = await asyncio.to_thread(flush_job_updates, pool, pending_updates, pending_marks)
+            for raw_id, error in failed.items():
+                print(f"    ✗ Save error ({raw_id}): {error[:100]}")
+            success_count -= len(failed)
+            error_count += len(failed)
+            processed = sum(1 for _, status, _ in pending_marks if status == 'processed')
+            saved = processed - len(failed)
+            print(f"\n    ✓ Saved {saved} jobs, {len(pending_marks) - saved} marked as errors")
+
+            # Cache only output the database accepted
+            to_cache = [(key, structured) for raw_id, key, structured in pending_cache if raw_id not in failed]
+            if to_cache and LLM_CACHE_ENABLED:
+                await asyncio.to_thread(save_cached_classifications, pool, to_cache)
+
+            # Sync to ZEP knowledge graph once the rows are committed
+            pending_syncs[:] = [args for args in pending_syncs if args[0]['raw_id'] not in failed]
+            synced = await asyncio.gather(*[bounded_sync(*args) for args in pending_syncs])
+            if pending_syncs and ZEP_SYNC_ENABLED:
+                print(f"    ✓ Synced {sum(synced)}/{len(pending_syncs)} jobs to ZEP graph")
+
+            pending_updates.clear()
+            pending_marks.clear()
+            pending_syncs.clear()
+            pending_cache.clear()
+
+        classifier = asyncio.create_task(classify_all())
+
+        while (item := await result_queue.get()) is not None:
+            job, result = item
+            job_count += 1
             title = job.get('title') or job.get('raw_data', {}).get('job_title', 'Unknown')
             company = job.get('company_name') or job.get('raw_data', {}).get('company_name', 'Unknown')
 
-            print(f"\n[{i+1}/{len(jobs)}] {title}")
-            print(f"    Company: {company}")
-            print(f"    Source: {job['source']}")
+            # Collect the per-job report and write it with a single print
+            lines = [
+                f"\n[{job_count}] {title}",
+                f"    Company: {company}",
+                f"    Source: {job['source']}",
+            ]
 
-            try:
-                # Classify with Pydantic AI
-                structured = await classify_job(job)
+            if isinstance(result, Exception):
+                lines.append(f"    ✗ Error: {str(result)[:100]}")
+                pending_marks.append((job['raw_id'], 'error', str(result)))
+                error_count += 1
+            else:
+                structured, cache_key = result
+                if cache_key:
+                    pending_cache.append((job['raw_id'], cache_key, structured))
 
                 # Update the structured jobs table
                 if job['job_id']:
-                    update_structured_job(conn, job['job_id'], structured)
-
-                    # Sync to ZEP knowledge graph
-                    zep_synced = await sync_job_to_zep(
-                        job['job_id'], structured, title, company,
-                        structured.city or job.get('location', 'UK')
-                    )
-                    if zep_synced:
-                        print(f"    ✓ Synced to ZEP graph")
+                    pending_updates.append((job['raw_id'], job['job_id'], structured))
+                    pending_syncs.append((job, structured, title, company))
 
                 # Mark as processed
-                mark_raw_job_processed(conn, job['raw_id'], 'processed')
-                conn.commit()
-
-                # Print summary
-                print(f"    ✓ Type: {structured.employment_type} {'(Part-Time)' if structured.is_fractional else ''}")
-                print(f"    ✓ Location: {structured.city or 'Unknown'}, {structured.country} {'🌐' if structured.is_remote else ''}")
-                print(f"    ✓ Vertical: {structured.vertical}")
-                print(f"    ✓ Level: {structured.seniority_level}")
+                pending_marks.append((job['raw_id'], 'processed', None))
+
+                # Summary
+                lines.append(f"    ✓ Type: {structured.employment_type} {'(Part-Time)' if structured.is_fractional else ''}")
+                lines.append(f"    ✓ Location: {structured.city or 'Unknown'}, {structured.country} {'🌐' if structured.is_remote else ''}")
+                lines.append(f"    ✓ Vertical: {structured.vertical}")
+                lines.append(f"    ✓ Level: {structured.seniority_level}")
                 if structured.salary_min or structured.salary_max:
-                    print(f"    ✓ Comp: {structured.salary_currency}{structured.salary_min or '?'}-{structured.salary_max or '?'} ({structured.salary_type})")
-                print(f"    ✓ Skills: {len(structured.skills_required)} extracted")
-                print(f"    ✓ Summary: {structured.summary[:80]}...")
+                    lines.append(f"    ✓ Comp: {structured.salary_currency}{structured.salary_min or '?'}-{structured.salary_max or '?'} ({structured.salary_type})")
+                lines.append(f"    ✓ Skills: {len(structured.skills_required)} extracted")
+                lines.append(f"    ✓ Summary: {structured.summary[:80]}...")
 
                 success_count += 1
 
-            except Exception as e:
-                print(f"    ✗ Error: {str(e)[:100]}")
-                mark_raw_job_processed(conn, job['raw_id'], 'error', str(e))
-                conn.commit()
-                error_count += 1
-                continue
+            print("\n".join(lines))
+
+            if len(pending_marks) >= batch_size:
+                await flush()
+
+        if pending_marks:
+            await flush()
+
+        # Surface any error from reading the pending jobs stream
+        await classifier
 
         print(f"\n{'='*60}")
         print(f"COMPLETE: {success_count} processed, {error_count} errors")
         print(f"{'='*60}\n")
 
     finally:
-        conn.close()
+        if classifier and not classifier.done():
+            classifier.cancel()
+            await asyncio.gather(classifier, return_exceptions=True)
+        # The generator can't be closed while a read is still running in its thread
+        if pending_fetch:
+            await asyncio.gather(pending_fetch, return_exceptions=True)
+        # Closing the server-side cursor and the pool both hit the network
+        try:
+            await asyncio.to_thread(rows.close)
+        except Exception as e:
+            # Don't mask the error that got us here
+            print(f"    ⚠ Error closing pending jobs stream: {str(e)[:100]}")
+        await zep_client.aclose()
+        await asyncio.to_thread(pool.close)
 
 
 if __name__ == "__main__":
@@ -475,12 +818,27 @@ if __name__ == "__main__":
     parser.add_argument('--limit', type=int, default=10, help='Number of jobs to process')
     parser.add_argument('--source', type=str, help='Filter by source (e.g., linkedin, greenhouse)')
     parser.add_argument('--all', action='store_true', help='Process all pending jobs')
+    parser.add_argument('--concurrency', type=int, default=10, help='Max concurrent LLM calls')
+    parser.add_argument('--batch-size', type=int, default=500, help='Jobs per bulk database write')
 
     args = parser.parse_args()
 
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+    if args.batch_size < 1:
+        parser.error('--batch-size must be at least 1')
+
     limit = 1000 if args.all else args.limit
 
     print(f"\nStarting Pydantic AI Job Classification...")
-    print(f"Limit: {limit}, Source: {args.source or 'all'}")
+    print(f"Limit: {limit}, Source: {args.source or 'all'}, Concurrency: {args.concurrency}")
+
+    main = process_jobs(limit=limit, source=args.source, concurrency=args.concurrency, batch_size=args.batch_size)
 
-    asyncio.run(process_jobs(limit=limit, source=args.source))
+    # uvloop is optional; fall back to the default event loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main)
+    else:
+        uvloop.run(main)
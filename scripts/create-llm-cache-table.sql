@@ -0,0 +1,13 @@
+-- LLM Classification Cache Table
+-- Run this in your Neon database console
+-- Used by scripts/classify_jobs.py to skip the LLM for identical jobs (e.g. reposts)
+
+CREATE TABLE IF NOT EXISTS llm_classification_cache (
+  key TEXT PRIMARY KEY,  -- sha256 of model + system prompt + schema + stable job fields
+  output JSONB NOT NULL,  -- StructuredJob.model_dump()
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Index for the per-run DELETE of entries older than LLM_CACHE_TTL_DAYS
+CREATE INDEX IF NOT EXISTS idx_llm_classification_cache_created_at
+ON llm_classification_cache(created_at);
@@ -0,0 +1,15 @@
+-- Raw Jobs Indexes
+-- Run this in your Neon database console
+-- Supports fetch_pending_raw_jobs in scripts/classify_jobs.py, which streams
+-- pending rows newest-first, optionally filtered by source. Partial indexes
+-- stay small because processed rows drop out of them.
+-- CONCURRENTLY avoids blocking concurrent inserts into raw_jobs; run each
+-- statement on its own (not inside a transaction).
+
+-- Index for pending jobs across all sources
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_raw_jobs_pending_received_at
+ON raw_jobs(received_at DESC) WHERE processing_status = 'pending';
+
+-- Index for pending jobs filtered by --source
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_raw_jobs_pending_source_received_at
+ON raw_jobs(source, received_at DESC) WHERE processing_status = 'pending';